@@ -3,25 +3,28 @@
 
 import os
 import sys
+import stat
+import functools
 import click
-from dotenv import load_dotenv
 from datetime import datetime
 
 from translator import (
     TranslationClient,
     TranslationService,
     UsageTracker,
+    TranslationCache,
+    get_tracker,
     validate_credentials,
     LANGUAGE_NAMES,
     DEFAULT_SOURCE_LANG,
     DEFAULT_TARGET_LANG,
     DEFAULT_OUTPUT_DIR,
+    DEFAULT_CONCURRENCY,
 )
 from translator.utils import get_pdf_files, get_pdf_files_recursive
 from translator.validators import validate_month
 
-# Load .env file
-load_dotenv()
+SEPARATOR = "=" * 60
 
 
 @click.group(invoke_without_command=True)
@@ -57,7 +60,18 @@ load_dotenv()
     is_flag=True,
     help='Recursive processing including subfolders (preserves folder structure)'
 )
-def cli(ctx, input, output, source, target, batch, recursive):
+@click.option(
+    '--concurrency', '--workers', '-c', '-w',
+    default=DEFAULT_CONCURRENCY,
+    type=click.IntRange(min=1),
+    help=f'Number of translation requests in flight at once (default: {DEFAULT_CONCURRENCY})'
+)
+@click.option(
+    '--no-cache',
+    is_flag=True,
+    help='Always call the API instead of reusing cached translations of unchanged files'
+)
+def cli(ctx, input, output, source, target, batch, recursive, concurrency, no_cache):
     """PDF Translation CLI Program (Google Cloud Translation API v3 Document Translation)
     
     Translates entire PDF documents while preserving layout and format, without text extraction.
@@ -73,9 +87,15 @@ def cli(ctx, input, output, source, target, batch, recursive):
         # Recursive translation including subfolders (preserves folder structure)
         python translate.py -i ./docs/ -o ./output/ --recursive
         
+        # Translate up to 4 files at a time
+        python translate.py -i ./docs/ --batch --concurrency 4
+        
         # Specify languages
         python translate.py -i ./docs/ -s en -t ko --batch
         
+        # Re-translate even if the file was translated before
+        python translate.py -i ./document.pdf --no-cache
+        
         # Auto language detection (empty string for source)
         python translate.py -i ./document.pdf -s "" -t ko
         
@@ -91,7 +111,7 @@ def cli(ctx, input, output, source, target, batch, recursive):
             click.echo("Usage: python translate.py --help", err=True)
             sys.exit(1)
         
-        ctx.invoke(translate_command, input=input, output=output, source=source, target=target, batch=batch, recursive=recursive)
+        ctx.invoke(translate_command, input=input, output=output, source=source, target=target, batch=batch, recursive=recursive, concurrency=concurrency, no_cache=no_cache)
 
 
 @cli.command(name='translate', hidden=True)
@@ -101,20 +121,30 @@ def cli(ctx, input, output, source, target, batch, recursive):
 @click.option('--target', '-t', default=DEFAULT_TARGET_LANG)
 @click.option('--batch', '-b', is_flag=True)
 @click.option('--recursive', '-r', is_flag=True)
-def translate_command(input: str, output: str, source: str, target: str, batch: bool, recursive: bool):
+@click.option('--concurrency', '--workers', '-c', '-w', default=DEFAULT_CONCURRENCY, type=click.IntRange(min=1))
+@click.option('--no-cache', is_flag=True)
+def translate_command(input: str, output: str, source: str, target: str, batch: bool, recursive: bool, concurrency: int, no_cache: bool):
     """Execute the translation command"""
     
+    # Load .env file (only translation needs the Google Cloud settings)
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     # Validate credentials
     validate_credentials()
     
     # Create output directory
     os.makedirs(output, exist_ok=True)
     
+    # Emoji banners are for terminals; redirected output gets one-line logs
+    plain_output = not sys.stdout.isatty()
+    
     # Initialize clients
     try:
         client = TranslationClient()
-        tracker = UsageTracker()
-        service = TranslationService(client, tracker)
+        tracker = get_tracker()
+        cache = None if no_cache else TranslationCache()
+        service = TranslationService(client, tracker, plain_output=plain_output, cache=cache)
     except Exception as e:
         click.echo(f"❌ Error: Failed to initialize: {str(e)}", err=True)
         sys.exit(1)
@@ -123,27 +153,44 @@ def translate_command(input: str, output: str, source: str, target: str, batch:
     pdf_files, is_recursive_mode, input_base_dir = _get_input_files(input, batch, recursive)
     
     # Get language display names
-    source_name = LANGUAGE_NAMES.get(source, source.upper())
-    target_name = LANGUAGE_NAMES.get(target, target.upper())
+    source_name = _lang_display(source)
+    target_name = _lang_display(target)
     
     # Display start message
-    _print_header(input, output, pdf_files, source_name, target_name, is_recursive_mode)
+    _print_header(input, output, pdf_files, source, target, source_name, target_name, is_recursive_mode, plain_output)
     
     # Process files
     success_count, total_cost = _process_files(
         service, pdf_files, output, source, target,
-        is_recursive_mode, input_base_dir
+        is_recursive_mode, input_base_dir, concurrency
     )
     
     # Display completion message
-    _print_footer(success_count, len(pdf_files), total_cost, tracker)
+    _print_footer(success_count, len(pdf_files), total_cost, tracker, plain_output)
+
+
+@functools.lru_cache(maxsize=64)
+def _lang_display(code: str) -> str:
+    """Get display name for a language code (falls back to the upper-cased code)"""
+    return LANGUAGE_NAMES.get(code, code.upper())
 
 
 def _get_input_files(input: str, batch: bool, recursive: bool):
-    """Get list of files to process based on input mode"""
+    """Get list of (file_path, relative_path) pairs to process based on input mode
+    
+    relative_path is the scanner's path below the input folder in recursive
+    mode and None otherwise.
+    """
+    # Stat the input once and reuse the result for every mode check
+    try:
+        input_stat = os.stat(input)
+    except OSError as e:
+        click.echo(f"❌ Error: Cannot access {input}: {e.strerror}", err=True)
+        sys.exit(1)
+    is_dir = stat.S_ISDIR(input_stat.st_mode)
     
     if recursive:
-        if not os.path.isdir(input):
+        if not is_dir:
             click.echo("❌ Error: --recursive option must be used with a folder path.", err=True)
             sys.exit(1)
         
@@ -152,15 +199,14 @@ def _get_input_files(input: str, batch: bool, recursive: bool):
             click.echo(f"❌ Error: No PDF files found in {input} folder.", err=True)
             sys.exit(1)
         
-        pdf_files = [abs_path for abs_path, rel_path in pdf_files_with_rel]
-        return pdf_files, True, input
+        return pdf_files_with_rel, True, input
         
-    elif batch or os.path.isdir(input):
-        if not os.path.isdir(input):
+    elif batch or is_dir:
+        if not is_dir:
             click.echo("❌ Error: --batch option must be used with a folder path.", err=True)
             sys.exit(1)
         
-        pdf_files = get_pdf_files(input)
+        pdf_files = [(pdf_file, None) for pdf_file in get_pdf_files(input)]
         if not pdf_files:
             click.echo(f"❌ Error: No PDF files found in {input} folder.", err=True)
             sys.exit(1)
@@ -172,69 +218,74 @@ def _get_input_files(input: str, batch: bool, recursive: bool):
             click.echo("❌ Error: Only PDF files are supported.", err=True)
             sys.exit(1)
         
-        return [input], False, None
+        return [(input, None)], False, None
 
 
-def _print_header(input: str, output: str, pdf_files: list, source_name: str, target_name: str, is_recursive: bool):
-    """Print translation job header"""
-    click.echo("\n" + "="*60)
-    click.echo("🌏 PDF Translator (Document Translation API)")
-    click.echo("="*60)
-    click.echo(f"📁 Input: {input} ({len(pdf_files)} files)")
-    click.echo(f"📂 Output: {output}")
+def _print_header(input: str, output: str, pdf_files: list, source: str, target: str, source_name: str, target_name: str, is_recursive: bool, plain: bool = False):
+    """Print translation job header (a single log line with language codes when plain)"""
+    if plain:
+        click.echo(
+            f"[start] input={input} output={output} files={len(pdf_files)} "
+            f"src={source or 'auto'} tgt={target} recursive={is_recursive}"
+        )
+        return
+    
+    lines = [
+        "\n" + SEPARATOR,
+        "🌏 PDF Translator (Document Translation API)",
+        SEPARATOR,
+        f"📁 Input: {input} ({len(pdf_files)} files)",
+        f"📂 Output: {output}",
+    ]
     if is_recursive:
-        click.echo("🔄 Mode: Recursive (preserves folder structure)")
-    click.echo(f"🌐 Translation: {source_name} → {target_name}")
-    click.echo("="*60)
+        lines.append("🔄 Mode: Recursive (preserves folder structure)")
+    lines.append(f"🌐 Translation: {source_name} → {target_name}")
+    lines.append(SEPARATOR)
+    click.echo("\n".join(lines))
 
 
-def _process_files(service, pdf_files: list, output: str, source: str, target: str, is_recursive: bool, input_base_dir: str):
-    """Process all files for translation"""
-    success_count = 0
-    total_cost = 0.0
-    
-    for idx, pdf_file in enumerate(pdf_files, 1):
-        click.echo(f"\n[{idx}/{len(pdf_files)}]", nl=False)
-        
-        # Generate output path
+def _process_files(service, pdf_files: list, output: str, source: str, target: str, is_recursive: bool, input_base_dir: str, concurrency: int):
+    """Process all files for translation, keeping up to `concurrency` API calls in flight"""
+    # Resolve output and display paths up front so workers only do API/disk I/O
+    # (both reuse the relative path the scanner already computed)
+    jobs = []
+    for pdf_file, rel_path in pdf_files:
         output_path = service.get_output_path(
             pdf_file, output, target,
             preserve_structure=is_recursive,
-            input_base_dir=input_base_dir
-        )
-        
-        # Get relative path for display
-        rel_path = None
-        if is_recursive and input_base_dir:
-            rel_path = os.path.relpath(pdf_file, input_base_dir)
-        
-        # Translate file
-        success, files, file_size = service.translate_file(
-            pdf_file, output_path, source, target, rel_path
+            input_base_dir=input_base_dir,
+            rel_path=rel_path
         )
         
-        if success:
-            success_count += 1
-            total_cost += service.tracker.calculate_cost(file_size)
+        jobs.append((pdf_file, output_path, rel_path))
     
-    return success_count, total_cost
+    return service.translate_batch(jobs, source, target, max_workers=concurrency)
 
 
-def _print_footer(success_count: int, total_files: int, total_cost: float, tracker: UsageTracker):
-    """Print translation job footer"""
-    click.echo("\n" + "="*60)
+def _print_footer(success_count: int, total_files: int, total_cost: float, tracker: UsageTracker, plain: bool = False):
+    """Print translation job footer (a single log line when plain)"""
+    summary = tracker.get_summary()
+    
+    if plain:
+        click.echo(
+            f"[done] succeeded={success_count}/{total_files} cost={total_cost:.2f} "
+            f"cumulative_files={summary['total_files']} cumulative_cost={summary['total_cost_usd']:.2f}"
+        )
+        return
+    
+    lines = ["\n" + SEPARATOR]
     
     if success_count == total_files:
-        click.echo(f"✅ Complete! Successfully translated {success_count} files")
+        lines.append(f"✅ Complete! Successfully translated {success_count} files")
     else:
-        click.echo(f"⚠️  Complete: {success_count}/{total_files} files succeeded")
+        lines.append(f"⚠️  Complete: {success_count}/{total_files} files succeeded")
     
     if total_cost > 0:
-        click.echo(f"💰 Estimated cost for this operation: ${total_cost:.2f}")
+        lines.append(f"💰 Estimated cost for this operation: ${total_cost:.2f}")
     
-    summary = tracker.get_summary()
-    click.echo(f"📊 Cumulative: {summary['total_files']} files | ${summary['total_cost_usd']:.2f}")
-    click.echo("="*60 + "\n")
+    lines.append(f"📊 Cumulative: {summary['total_files']} files | ${summary['total_cost_usd']:.2f}")
+    lines.append(SEPARATOR + "\n")
+    click.echo("\n".join(lines))
 
 
 @cli.command()
@@ -278,7 +329,7 @@ def stats(detail: bool, month: int, year: int, clear: bool):
         # Clear usage history
         python translate.py stats --clear
     """
-    tracker = UsageTracker()
+    tracker = get_tracker()
     
     # Clear history
     if clear:
@@ -309,26 +360,30 @@ def _show_monthly_stats(tracker: UsageTracker, month: int, year: int):
     
     monthly = tracker.get_monthly_summary(year, month)
     
-    click.echo("\n" + "="*60)
-    click.echo(f"📅 Usage Statistics for {year}-{month:02d}")
-    click.echo("="*60)
-    click.echo(f"📄 Files translated: {monthly['files']}")
-    click.echo(f"📊 Total size: {monthly['size_mb']:.2f} MB")
-    click.echo(f"💰 Estimated cost: ${monthly['cost_usd']:.2f} USD")
-    click.echo("="*60 + "\n")
+    click.echo(
+        f"\n{SEPARATOR}\n"
+        f"📅 Usage Statistics for {year}-{month:02d}\n"
+        f"{SEPARATOR}\n"
+        f"📄 Files translated: {monthly['files']}\n"
+        f"📊 Total size: {monthly['size_mb']:.2f} MB\n"
+        f"💰 Estimated cost: ${monthly['cost_usd']:.2f} USD\n"
+        f"{SEPARATOR}\n"
+    )
 
 
 def _show_summary(tracker: UsageTracker, detail: bool):
     """Show overall summary"""
     summary = tracker.get_summary()
     
-    click.echo("\n" + "="*60)
-    click.echo("📊 PDF Translator - Usage Statistics")
-    click.echo("="*60)
-    click.echo(f"📄 Total files translated: {summary['total_files']}")
-    click.echo(f"📦 Total data processed: {summary['total_size_mb']:.2f} MB")
-    click.echo(f"💰 Cumulative estimated cost: ${summary['total_cost_usd']:.2f} USD")
-    click.echo("="*60)
+    click.echo(
+        f"\n{SEPARATOR}\n"
+        f"📊 PDF Translator - Usage Statistics\n"
+        f"{SEPARATOR}\n"
+        f"📄 Total files translated: {summary['total_files']}\n"
+        f"📦 Total data processed: {summary['total_size_mb']:.2f} MB\n"
+        f"💰 Cumulative estimated cost: ${summary['total_cost_usd']:.2f} USD\n"
+        f"{SEPARATOR}"
+    )
     
     if detail:
         _show_detailed_history(tracker)
@@ -338,24 +393,27 @@ def _show_summary(tracker: UsageTracker, detail: bool):
 
 def _show_detailed_history(tracker: UsageTracker):
     """Show detailed translation history"""
-    translations = tracker.get_recent_translations(limit=10)
+    translations = tracker.get_recent_translations(limit=10, order="desc")
     
     if not translations:
         click.echo("\n📭 No translation history found.\n")
         return
     
-    click.echo(f"\n📋 Recent Translation History (max 10 records):\n")
+    lines = ["\n📋 Recent Translation History (max 10 records):\n"]
     
-    for i, record in enumerate(reversed(translations), 1):
-        timestamp = datetime.fromisoformat(record['timestamp'])
-        date_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+    for i, record in enumerate(translations, 1):
+        # ISO timestamps already read YYYY-MM-DDTHH:MM:SS; drop any fraction
+        date_str = record['timestamp'][:19].replace('T', ' ')
         
-        click.echo(f"{i}. {record['input_file']}")
-        click.echo(f"   🕐 {date_str}")
-        click.echo(f"   🌐 {record['source_lang']} → {record['target_lang']}")
-        click.echo(f"   📊 {record['file_size_mb']:.2f} MB | 💰 ${record['estimated_cost_usd']:.2f}")
-        click.echo(f"   → {record['output_file']}")
-        click.echo()
+        lines.append(
+            f"{i}. {record['input_file']}\n"
+            f"   🕐 {date_str}\n"
+            f"   🌐 {record['source_lang']} → {record['target_lang']}\n"
+            f"   📊 {record['file_size_mb']:.2f} MB | 💰 ${record['estimated_cost_usd']:.2f}\n"
+            f"   → {record['output_file']}\n"
+        )
+    
+    click.echo("\n".join(lines))
 
 
 if __name__ == '__main__':
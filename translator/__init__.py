@@ -4,7 +4,8 @@ __version__ = "2.0.0"
 
 from .client import TranslationClient
 from .utils import save_translated_document, get_pdf_files, format_file_size
-from .usage import UsageTracker
+from .usage import UsageTracker, get_tracker
+from .cache import TranslationCache
 from .service import TranslationService
 from .validators import validate_credentials
 from .config import (
@@ -12,12 +13,15 @@ from .config import (
     DEFAULT_SOURCE_LANG,
     DEFAULT_TARGET_LANG,
     DEFAULT_OUTPUT_DIR,
+    DEFAULT_CONCURRENCY,
 )
 
 __all__ = [
     "TranslationClient",
     "TranslationService",
     "UsageTracker",
+    "get_tracker",
+    "TranslationCache",
     "save_translated_document",
     "get_pdf_files",
     "format_file_size",
@@ -26,4 +30,6 @@ __all__ = [
     "DEFAULT_SOURCE_LANG",
     "DEFAULT_TARGET_LANG",
     "DEFAULT_OUTPUT_DIR",
+    "DEFAULT_CONCURRENCY",
 ]
+
@@ -0,0 +1,91 @@
+"""On-disk cache of translated documents"""
+
+import hashlib
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import suppress
+from typing import Optional
+
+from .config import CACHE_DIR
+
+
+class TranslationCache:
+    """Translated document cache keyed by input content hash and language pair"""
+    
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        """
+        Initialize translation cache
+        
+        Args:
+            cache_dir: Directory where cached translations are stored
+        """
+        self.cache_dir = cache_dir
+    
+    def make_key(self, file_path: str, source_lang: str, target_lang: str) -> str:
+        """
+        Build the cache key for a document translation
+        
+        Args:
+            file_path: Path to input file
+            source_lang: Source language code (empty for auto-detection)
+            target_lang: Target language code
+        
+        Returns:
+            Cache key (sha256 of the file content plus both language codes)
+        """
+        # Hash straight from a read-only mapping of the file: no bytes copy is
+        # made, and the pages it faults in are the ones the upload reads next
+        with open(file_path, "rb") as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest = hashlib.sha256(mm).hexdigest()
+            except ValueError:
+                # Empty files cannot be mapped
+                digest = hashlib.sha256(f.read()).hexdigest()
+        
+        return f"{digest}_{source_lang or 'auto'}_{target_lang}"
+    
+    def fetch(self, key: str, output_path: str) -> Optional[int]:
+        """
+        Copy a cached translation to output_path
+        
+        Args:
+            key: Cache key from make_key()
+            output_path: Destination file path
+        
+        Returns:
+            Size of the copied file in bytes, or None on a cache miss
+        """
+        cached_path = os.path.join(self.cache_dir, key)
+        try:
+            shutil.copyfile(cached_path, output_path)
+            return os.path.getsize(output_path)
+        except OSError:
+            return None
+    
+    def store(self, key: str, output_path: str) -> bool:
+        """
+        Add a translated file to the cache
+        
+        Args:
+            key: Cache key from make_key()
+            output_path: Translated file to cache
+        
+        Returns:
+            True if the file was cached
+        """
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".cache_", suffix=".tmp")
+            os.close(fd)
+            shutil.copyfile(output_path, tmp_path)
+            os.replace(tmp_path, os.path.join(self.cache_dir, key))
+            return True
+        except OSError:
+            if tmp_path:
+                with suppress(OSError):
+                    os.remove(tmp_path)
+            return False
@@ -1,9 +1,17 @@
 """Google Cloud Translation API Client"""
 
 import os
-from google.cloud import translate_v3 as translate
 from typing import Dict
 
+from .config import (
+    GRPC_ENDPOINT,
+    GRPC_CHANNEL_OPTIONS,
+    DEFAULT_MIME_TYPE,
+    RETRY_INITIAL_DELAY_SEC,
+    RETRY_MAX_DELAY_SEC,
+    RETRY_TIMEOUT_SEC,
+)
+
 
 class TranslationClient:
     """Google Cloud Translation API v3 Client Wrapper (Document Translation)"""
@@ -19,16 +27,49 @@ class TranslationClient:
         if not self.project_id:
             raise ValueError("GOOGLE_CLOUD_PROJECT environment variable is not set.")
         
-        self.client = translate.TranslationServiceClient()
+        # The SDK (gRPC + protobuf) is imported here rather than at module level
+        # so that importing the package stays cheap for commands that never translate
+        from google.cloud import translate_v3 as translate
+        from google.cloud.translate_v3.services.translation_service.transports import (
+            TranslationServiceGrpcTransport,
+        )
+        from google.api_core import exceptions, retry
+        self._request_type = translate.TranslateDocumentRequest
+        
+        # Back off and retry when parallel requests hit the quota (429) or the
+        # service is briefly unavailable, instead of failing those files
+        self._retry = retry.Retry(
+            predicate=retry.if_exception_type(
+                exceptions.ResourceExhausted,
+                exceptions.ServiceUnavailable,
+            ),
+            initial=RETRY_INITIAL_DELAY_SEC,
+            maximum=RETRY_MAX_DELAY_SEC,
+            timeout=RETRY_TIMEOUT_SEC,
+        )
+        self._request_pb_type = self._request_type.pb()
+        
+        # Use the gRPC transport over a single keepalive channel so every
+        # translation (and every worker thread) reuses one connection
+        channel = TranslationServiceGrpcTransport.create_channel(
+            GRPC_ENDPOINT,
+            options=GRPC_CHANNEL_OPTIONS
+        )
+        self.client = translate.TranslationServiceClient(
+            transport=TranslationServiceGrpcTransport(channel=channel)
+        )
         self.location = "us-central1"  # 또는 "global"
         self.parent = f"projects/{self.project_id}/locations/{self.location}"
+        
+        # Fields shared by every request, built once and copied per call
+        self._request_template = self._request_pb_type(parent=self.parent)
     
     def translate_document(
         self,
         file_path: str,
         target_language: str = "ko",
         source_language: str = "ja",
-        mime_type: str = "application/pdf"
+        mime_type: str = DEFAULT_MIME_TYPE
     ) -> Dict:
         """
         Translate document file (PDF, DOCX, etc.)
@@ -43,29 +84,27 @@ class TranslationClient:
             Dictionary with translated document info (document_content, mime_type)
         """
         try:
-            # 파일 읽기
-            with open(file_path, "rb") as f:
-                document_content = f.read()
+            # 번역 요청 (원시 protobuf 메시지로 직접 구성)
+            # proto-plus의 dict 변환은 파일 바이트를 여러 번 복사하고, bytes 필드는
+            # mmap/memoryview를 받지 않으므로, 파일 내용을 메시지에 한 번만 복사해
+            # RPC 동안 별도의 Python bytes 객체가 남지 않도록 합니다
+            request_pb = self._request_pb_type()
+            request_pb.CopyFrom(self._request_template)
+            request_pb.target_language_code = target_language
             
-            # 문서 입력 설정
-            document_input_config = {
-                "content": document_content,
-                "mime_type": mime_type,
-            }
-            
-            # 번역 요청
-            request = {
-                "parent": self.parent,
-                "target_language_code": target_language,
-                "document_input_config": document_input_config,
-            }
+            # 파일 읽기 → 문서 입력 설정
+            with open(file_path, "rb") as f:
+                request_pb.document_input_config.content = f.read()
+            request_pb.document_input_config.mime_type = mime_type
             
             # source_language가 지정된 경우에만 추가 (자동 감지도 가능)
             if source_language:
-                request["source_language_code"] = source_language
+                request_pb.source_language_code = source_language
+            
+            request = self._request_type.wrap(request_pb)
             
-            # API 호출
-            response = self.client.translate_document(request=request)
+            # API 호출 (할당량 초과 시 지수 백오프로 재시도)
+            response = self.client.translate_document(request=request, retry=self._retry)
             
             return {
                 "document_content": response.document_translation.byte_stream_outputs[0],
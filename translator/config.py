@@ -1,5 +1,6 @@
 """Configuration constants and settings"""
 
+import os
 from typing import Dict
 
 
@@ -8,6 +9,21 @@ DEFAULT_LOCATION = "us-central1"
 MAX_FILE_SIZE_MB = 10
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 
+# gRPC Channel Settings (one channel is shared by every request in a run)
+GRPC_ENDPOINT = "translate.googleapis.com:443"
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),   # Keep the HTTP/2 connection alive between files
+    ("grpc.keepalive_timeout_ms", 10000),  # Drop a dead connection instead of hanging on it
+    ("grpc.http2.max_pings_without_data", 0),  # Allow pings during long uploads/translations
+]
+
+# Retry Settings (for quota errors while many files are translated in parallel)
+RETRY_INITIAL_DELAY_SEC = 1.0     # First backoff delay, doubled after each attempt
+RETRY_MAX_DELAY_SEC = 30.0        # Longest single backoff delay
+RETRY_TIMEOUT_SEC = 300.0         # Give up on a file after retrying this long
+
 # Cost Estimation
 COST_PER_PAGE_FIRST_500 = 0.075  # USD per page (first 500 pages/month)
 COST_PER_PAGE_OVER_500 = 0.045   # USD per page (over 500 pages)
@@ -34,10 +50,22 @@ LANGUAGE_NAMES: Dict[str, str] = {
 DEFAULT_SOURCE_LANG = 'ja'
 DEFAULT_TARGET_LANG = 'ko'
 DEFAULT_OUTPUT_DIR = './output'
+DEFAULT_CONCURRENCY = 8           # Translation requests in flight at once
 
 # File Settings
 USAGE_HISTORY_FILE = "usage_history.json"
+USAGE_SAVE_EVERY = 10             # Save usage history after this many new records...
+USAGE_SAVE_INTERVAL_SEC = 5.0     # ...or once this many seconds have passed since the last save
+DEFAULT_MIME_TYPE = 'application/pdf'
 SUPPORTED_MIME_TYPES = {
     '.pdf': 'application/pdf',
     '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
 }
+SUPPORTED_SUFFIXES = frozenset(SUPPORTED_MIME_TYPES)
+SUPPORTED_SUFFIXES_TEXT = ', '.join(SUPPORTED_MIME_TYPES)  # For error messages
+
+# Translation Cache (reused when the same file is translated again with the same languages)
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "pdf-translater",
+)
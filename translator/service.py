@@ -1,30 +1,51 @@
 """Translation service orchestration layer"""
 
 import os
-import click
-from pathlib import Path
-from typing import Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
 from .client import TranslationClient
-from .utils import save_translated_document, format_file_size
-from .usage import UsageTracker
-from .validators import validate_file_path, check_file_size
-from .config import MAX_FILE_SIZE_MB
+from .cache import TranslationCache
+from .utils import save_translated_document, format_file_size, relative_path, ensure_dir, split_suffix, echo
+from .usage import UsageTracker, get_tracker
+from .validators import stat_and_validate, check_file_size
+from .config import MAX_FILE_SIZE_MB, SUPPORTED_MIME_TYPES, SUPPORTED_SUFFIXES, DEFAULT_MIME_TYPE, DEFAULT_CONCURRENCY
+
+
+@dataclass
+class JobSpec:
+    """One file's translation, resolved before any API call is made"""
+    input_path: str
+    output_path: str
+    display_path: str  # Name shown in progress output
+    file_size: int  # Input size in bytes
+    mime_type: str
 
 
 class TranslationService:
     """High-level translation service that orchestrates the translation process"""
     
-    def __init__(self, client: TranslationClient, tracker: Optional[UsageTracker] = None):
+    def __init__(
+        self,
+        client: TranslationClient,
+        tracker: Optional[UsageTracker] = None,
+        plain_output: bool = False,
+        cache: Optional[TranslationCache] = None
+    ):
         """
         Initialize translation service
         
         Args:
             client: Translation API client
-            tracker: Usage tracker (optional)
+            tracker: Usage tracker (optional, defaults to the shared tracker)
+            plain_output: Print one-line logs instead of emoji blocks (for non-TTY output)
+            cache: Translation cache used to skip files translated before (optional)
         """
         self.client = client
-        self.tracker = tracker or UsageTracker()
+        self.tracker = tracker or get_tracker()
+        self.plain_output = plain_output
+        self.cache = cache
     
     def translate_file(
         self,
@@ -33,7 +54,7 @@ class TranslationService:
         source_lang: str,
         target_lang: str,
         show_relative_path: Optional[str] = None
-    ) -> Tuple[bool, int, int]:
+    ) -> Tuple[bool, int, int, float]:
         """
         Translate a single PDF file
         
@@ -45,65 +66,244 @@ class TranslationService:
             show_relative_path: Relative path to display (optional)
             
         Returns:
-            Tuple of (success, file_count, file_size)
+            Tuple of (success, file_count, file_size, estimated_cost)
         """
         try:
-            # Validate file
-            validate_file_path(input_path)
+            job = self._prepare_job(input_path, output_path, show_relative_path)
+        except Exception as e:
+            display_path = show_relative_path or os.path.basename(input_path)
+            self._report(self._error_report(input_path, display_path, e), error=True)
+            return False, 0, 0, 0.0
+        
+        success, file_count, file_size, estimated_cost, report = self._execute(job, source_lang, target_lang)
+        self._report(report, error=not success)
+        return success, file_count, file_size, estimated_cost
+    
+    def translate_batch(
+        self,
+        jobs: List[Tuple[str, str, Optional[str]]],
+        source_lang: str,
+        target_lang: str,
+        max_workers: int = DEFAULT_CONCURRENCY
+    ) -> Tuple[int, float]:
+        """
+        Translate many files, keeping up to max_workers API calls in flight
+        
+        The workload is network-I/O-bound: CPU and disk sit idle while each
+        file waits on the Translation API, so throughput scales with the number
+        of requests in flight rather than with os.cpu_count(). Raise
+        max_workers until the project's API quota or upload bandwidth saturates.
+        
+        Every file is validated up front, before any request is sent, so the
+        worker threads only do API calls and disk writes.
+        
+        Args:
+            jobs: List of (input_path, output_path, show_relative_path) tuples
+            source_lang: Source language code
+            target_lang: Target language code
+            max_workers: Maximum number of concurrent translations
             
-            # Display file info
-            filename = os.path.basename(input_path)
-            display_path = show_relative_path if show_relative_path else filename
-            click.echo(f"\n📄 {display_path}")
+        Returns:
+            Tuple of (success_count, total_cost)
+        """
+        success_count = 0
+        total_cost = 0.0
+        total = len(jobs)
+        done = 0
+        
+        prepared = []
+        for input_path, output_path, rel_path in jobs:
+            try:
+                prepared.append(self._prepare_job(input_path, output_path, rel_path))
+            except Exception as e:
+                done += 1
+                report = self._error_report(input_path, rel_path or os.path.basename(input_path), e)
+                self._report(report, error=True, progress=f"[{done}/{total}]")
+        
+        # Save any usage history still pending when the batch ends
+        with self.tracker.batch(), ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._execute, job, source_lang, target_lang)
+                for job in prepared
+            ]
             
-            # Check file size
-            file_size, exceeds_limit = check_file_size(input_path)
-            click.echo(f"   📊 File size: {format_file_size(file_size)}")
+            # Report each file in completion order, its progress counter and
+            # block in one write so the counter always heads its own file
+            try:
+                for future in as_completed(futures):
+                    success, _, _, cost, report = future.result()
+                    done += 1
+                    self._report(report, error=not success, progress=f"[{done}/{total}]")
+                    
+                    if success:
+                        success_count += 1
+                        total_cost += cost
+            except BaseException:
+                # Ctrl-C (or any error) must not let the queued files go on to
+                # make billed API calls; only those already in flight finish
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        
+        return success_count, total_cost
+    
+    def _prepare_job(
+        self,
+        input_path: str,
+        output_path: str,
+        show_relative_path: Optional[str] = None
+    ) -> JobSpec:
+        """
+        Validate one file and resolve everything its translation needs
+        
+        This is the local, CPU/metadata-only part of a translation; nothing is
+        sent to the API here.
+        
+        Args:
+            input_path: Path to input file
+            output_path: Path to output file
+            show_relative_path: Relative path to display (optional)
+            
+        Returns:
+            JobSpec for _execute()
             
-            if exceeds_limit:
-                click.echo(
-                    f"   ⚠️  Warning: File exceeds {MAX_FILE_SIZE_MB}MB. "
+        Raises:
+            click.ClickException if the file cannot be translated
+        """
+        filename = os.path.basename(input_path)
+        display_path = show_relative_path if show_relative_path else filename
+        
+        # Validate file (the same stat supplies the size, so each file is stat-ed once)
+        input_stat = stat_and_validate(input_path)
+        
+        # Check file size
+        file_size, exceeds_limit = check_file_size(input_path, input_stat.st_size)
+        
+        if exceeds_limit:
+            if self.plain_output:
+                self.echo(f"[warn] {input_path} exceeds {MAX_FILE_SIZE_MB}MB", err=True)
+            else:
+                self.echo(
+                    f"⚠️  Warning: {display_path} exceeds {MAX_FILE_SIZE_MB}MB. "
                     f"Processing may take longer.",
                     err=True
                 )
+        
+        # Make sure the output folder exists before spending an API call
+        ensure_dir(os.path.dirname(output_path))
+        
+        _, ext = split_suffix(filename)
+        return JobSpec(
+            input_path=input_path,
+            output_path=output_path,
+            display_path=display_path,
+            file_size=file_size,
+            mime_type=SUPPORTED_MIME_TYPES.get(ext, DEFAULT_MIME_TYPE)
+        )
+    
+    def _execute(self, job: JobSpec, source_lang: str, target_lang: str) -> Tuple[bool, int, int, float, str]:
+        """
+        Translate, save and record one prepared file
+        
+        Nothing is printed here: the report is returned so the caller can
+        write it in one piece, together with its progress counter, and
+        concurrent translations never interleave their output.
+        
+        Args:
+            job: JobSpec from _prepare_job()
+            source_lang: Source language code
+            target_lang: Target language code
             
-            # Translate document
-            click.echo("   🌐 Translating document...", nl=False)
-            
-            result = self.client.translate_document(
-                file_path=input_path,
-                target_language=target_lang,
-                source_language=source_lang,
-                mime_type="application/pdf"
-            )
-            
-            click.echo(" ✓")
-            
-            # Save translated document
-            click.echo("   💾 Saving file...", nl=False)
-            save_translated_document(result["document_content"], output_path)
-            
-            output_size = format_file_size(os.path.getsize(output_path))
-            click.echo(f" ✓ ({output_size})")
-            click.echo(f"   → {output_path}")
-            
-            # Track usage
-            estimated_cost = self.tracker.calculate_cost(file_size)
-            click.echo(f"   💰 Estimated cost: ${estimated_cost:.2f}")
-            
-            self.tracker.add_translation(
-                input_file=input_path,
-                output_file=output_path,
-                source_lang=source_lang,
-                target_lang=target_lang,
-                file_size_bytes=file_size
-            )
+        Returns:
+            Tuple of (success, file_count, file_size, estimated_cost, report)
+        """
+        try:
+            # Reuse an earlier translation of the same content and languages
+            cache_key = None
+            output_bytes = None
+            if self.cache:
+                cache_key = self.cache.make_key(job.input_path, source_lang, target_lang)
+                output_bytes = self.cache.fetch(cache_key, job.output_path)
+            cached = output_bytes is not None
             
-            return True, 1, file_size
+            if cached:
+                # No API call was made, so there is nothing to bill or track
+                estimated_cost = 0.0
+            else:
+                # Translate document
+                result = self.client.translate_document(
+                    file_path=job.input_path,
+                    target_language=target_lang,
+                    source_language=source_lang,
+                    mime_type=job.mime_type
+                )
+                
+                # Save translated document
+                output_bytes = save_translated_document(
+                    result["document_content"], job.output_path, create_dirs=False
+                )
+                del result  # Release the translated bytes before the next file is in flight
+                
+                if cache_key:
+                    self.cache.store(cache_key, job.output_path)
+                
+                # Track usage
+                estimated_cost = self.tracker.calculate_cost(job.file_size)
+                
+                self.tracker.add_translation(
+                    input_file=job.input_path,
+                    output_file=job.output_path,
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    file_size_bytes=job.file_size
+                )
             
         except Exception as e:
-            click.echo(f"\n❌ Error: {str(e)}", err=True)
-            return False, 0, 0
+            return False, 0, 0, 0.0, self._error_report(job.input_path, job.display_path, e)
+        
+        # Sizes are only formatted for the human-readable block
+        if self.plain_output:
+            report = (
+                f"[{'cached' if cached else 'ok'}] {job.input_path} -> {job.output_path} "
+                f"size={job.file_size} cost={estimated_cost:.2f}"
+            )
+        else:
+            step = "♻️  Reusing cached translation" if cached else "🌐 Translating document"
+            report = (
+                f"📄 {job.display_path}\n"
+                f"   📊 File size: {format_file_size(job.file_size)}\n"
+                f"   {step}... ✓\n"
+                f"   💾 Saving file... ✓ ({format_file_size(output_bytes)})\n"
+                f"   → {job.output_path}\n"
+                f"   💰 Estimated cost: ${estimated_cost:.2f}"
+            )
+        return True, 1, job.file_size, estimated_cost, report
+    
+    def _error_report(self, input_path: str, display_path: str, error: Exception) -> str:
+        """Build the report for a file that failed"""
+        if self.plain_output:
+            return f"[error] {input_path}: {str(error)}"
+        return f"📄 {display_path}\n❌ Error: {str(error)}"
+    
+    def _report(self, report: str, error: bool = False, progress: Optional[str] = None) -> None:
+        """
+        Print one file's report as a single write
+        
+        Args:
+            report: Report from _execute() or _error_report()
+            error: Write to stderr instead of stdout
+            progress: "[done/total]" counter heading the block (emoji output only)
+        """
+        if self.plain_output:
+            self.echo(report, err=error)
+        elif progress:
+            self.echo(f"\n{progress} {report}", err=error)
+        else:
+            self.echo(f"\n{report}", err=error)
+    
+    @staticmethod
+    def echo(message: str, err: bool = False) -> None:
+        """Write one message to the console while holding the shared print lock"""
+        echo(message, err=err)
     
     def get_output_path(
         self,
@@ -111,7 +311,8 @@ class TranslationService:
         output_dir: str,
         target_lang: str,
         preserve_structure: bool = False,
-        input_base_dir: Optional[str] = None
+        input_base_dir: Optional[str] = None,
+        rel_path: Optional[str] = None
     ) -> str:
         """
         Generate output file path
@@ -122,27 +323,23 @@ class TranslationService:
             target_lang: Target language code
             preserve_structure: Whether to preserve folder structure
             input_base_dir: Base directory for relative path calculation
+            rel_path: Path of input_path relative to input_base_dir, if the
+                caller already computed it
             
         Returns:
             Output file path
         """
         if preserve_structure and input_base_dir:
             # Preserve folder structure
-            rel_path = os.path.relpath(input_path, input_base_dir)
-            rel_dir = os.path.dirname(rel_path)
-            filename = os.path.basename(rel_path)
-            
-            # Add language code to filename
-            name_without_ext = os.path.splitext(filename)[0]
-            new_filename = f"{name_without_ext}_{target_lang}.pdf"
-            
-            # Create output path with structure
-            output_path = os.path.join(output_dir, rel_dir, new_filename)
+            rel_dir, filename = os.path.split(rel_path or relative_path(input_path, input_base_dir))
         else:
             # Save directly to output directory
-            filename = os.path.basename(input_path)
-            name_without_ext = os.path.splitext(filename)[0]
-            new_filename = f"{name_without_ext}_{target_lang}.pdf"
-            output_path = os.path.join(output_dir, new_filename)
+            rel_dir, filename = "", os.path.basename(input_path)
+        
+        # Add language code to filename, keeping the extension of supported
+        # document types (anything else is written as PDF)
+        name_without_ext, ext = split_suffix(filename)
+        if ext not in SUPPORTED_SUFFIXES:
+            ext = ".pdf"
         
-        return output_path
+        return os.path.join(output_dir, rel_dir, f"{name_without_ext}_{target_lang}{ext}")
@@ -1,49 +1,263 @@
 """API usage tracking and cost calculation"""
 
+import atexit
+import functools
 import json
 import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import suppress
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
+
+from .utils import echo
+from .config import USAGE_HISTORY_FILE, USAGE_SAVE_INTERVAL_SEC, USAGE_SAVE_EVERY
+
+try:
+    import orjson  # Optional: much faster (de)serialization of large histories
+except ImportError:
+    orjson = None
+
+
+def _loads(buf: bytes) -> Dict:
+    """Parse JSON from UTF-8 bytes"""
+    return orjson.loads(buf) if orjson else json.loads(buf)
+
+
+def _dumps(data: Dict) -> bytes:
+    """Serialize data as indented UTF-8 JSON"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _dumps_line(record: Dict) -> bytes:
+    """Serialize one record as a compact JSON line"""
+    if orjson:
+        return orjson.dumps(record) + b"\n"
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode('utf-8') + b"\n"
+
+
+def _write_atomic(path: str, payload: bytes):
+    """
+    Replace path with payload via a temporary file and os.replace
+    
+    Readers never see a half-written file, and the file is created with
+    mkstemp's owner-only (0600) permissions. No fsync: losing the last
+    run's records on a crash is acceptable.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".usage_", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def _empty_totals() -> Dict:
+    """Usage totals for an empty history"""
+    return {
+        "total_files": 0,
+        "total_cost_usd": 0.0,
+        "total_size_mb": 0.0,
+        "monthly_index": {}
+    }
+
+
+def _add_to_month(monthly_index: Dict, record: Dict):
+    """Add one record to its "YYYY-MM" bucket of the monthly index"""
+    month = monthly_index.setdefault(
+        record["timestamp"][:7],  # Slicing avoids parsing every timestamp
+        {"files": 0, "cost_usd": 0.0, "size_mb": 0.0}
+    )
+    month["files"] += 1
+    month["cost_usd"] = round(month["cost_usd"] + record["estimated_cost_usd"], 2)
+    month["size_mb"] = round(month["size_mb"] + record["file_size_mb"], 2)
 
 
 class UsageTracker:
-    """API usage tracker"""
+    """
+    API usage tracker
+    
+    Usage is stored in two files: the usage file holds only the running
+    totals, and a JSON Lines log next to it (same name, `.jsonl` extension)
+    holds one line per translation. Recording a translation appends one line
+    and rewrites the small totals file, so its cost no longer grows with the
+    size of the history.
+    
+    Writes are debounced: pending records are saved once USAGE_SAVE_EVERY
+    have accumulated or USAGE_SAVE_INTERVAL_SEC have passed since the last
+    save, when a batch block exits, and at interpreter exit.
+    """
     
     def __init__(self, usage_file: str = "usage_history.json"):
         """
         Initialize usage tracker
         
         Args:
-            usage_file: JSON file path to save usage history
+            usage_file: JSON file path to save usage totals
+                (records go to the matching .jsonl file)
         """
         self.usage_file = usage_file
+        self.log_file = os.path.splitext(usage_file)[0] + ".jsonl"
         self.data = self._load_data()
+        self._data_mtime = self._file_mtime()  # Usage file version self.data matches
+        self._lock = threading.Lock()  # Serializes updates from concurrent translations
+        self._log = None  # Append handle for the record log, opened on first write
+        self._batch_depth = 0
+        self._dirty = False
+        self._pending = 0  # Records added since the last save
+        self._last_save = time.monotonic()
+        atexit.register(self.flush)
+        self._upgrade_data()
+    
+    def _upgrade_data(self):
+        """Bring data saved by older versions up to the current format"""
+        self._migrate_records()
+        if "monthly_index" not in self.data:
+            self._build_monthly_index()
+    
+    def _file_mtime(self) -> Optional[int]:
+        """Modification time of the usage file in nanoseconds, or None if it is missing"""
+        try:
+            return os.stat(self.usage_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_if_changed(self) -> bool:
+        """
+        Reload the totals if another process rewrote the usage file
+        
+        Returns:
+            True if the data was reloaded
+        """
+        with self._lock:
+            mtime = self._file_mtime()
+            if self._dirty or mtime == self._data_mtime:
+                return False
+            self.data = self._load_data()
+            self._data_mtime = mtime
+        
+        self._upgrade_data()
+        return True
     
     def _load_data(self) -> Dict:
-        """Load saved usage history data"""
+        """Load saved usage totals"""
         if os.path.exists(self.usage_file):
             try:
-                with open(self.usage_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.usage_file, 'rb') as f:
+                    return _loads(f.read())
             except Exception:
                 pass
         
-        return {
-            "total_files": 0,
-            "total_cost_usd": 0.0,
-            "total_size_mb": 0.0,
-            "translations": []
-        }
+        return _empty_totals()
+    
+    def _migrate_records(self):
+        """Move records from the old single-file format into the record log"""
+        records = self.data.pop("translations", None)
+        if records is None:
+            return
+        
+        if records and not os.path.exists(self.log_file):
+            try:
+                # Written atomically: a partial log left by an interrupted run
+                # would otherwise be taken as complete and the rest dropped
+                _write_atomic(self.log_file, b"".join(_dumps_line(record) for record in records))
+            except Exception as e:
+                # Keep the old file untouched so nothing is lost
+                self.data["translations"] = records
+                echo(f"⚠️ Failed to migrate usage history: {str(e)}", err=True)
+                return
+        
+        self._save_data()
+    
+    def _build_monthly_index(self):
+        """Aggregate per-month usage from the record log (histories saved before the index existed)"""
+        monthly_index = {}
+        for record in self.iter_translations():
+            _add_to_month(monthly_index, record)
+        
+        self.data["monthly_index"] = monthly_index
+        if monthly_index:
+            self._save_data()
     
     def _save_data(self):
-        """Save usage history data to file"""
+        """Save usage totals to file (atomically, see _write_atomic)"""
         try:
-            with open(self.usage_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
+            _write_atomic(self.usage_file, _dumps(self.data))
+            self._data_mtime = self._file_mtime()
         except Exception as e:
-            print(f"⚠️ Failed to save usage history: {str(e)}")
+            echo(f"⚠️ Failed to save usage history: {str(e)}", err=True)
+    
+    def __enter__(self) -> "UsageTracker":
+        """
+        Make sure pending history is written when the block exits
+        
+        Records added inside `with tracker:` are saved by the usual debounce
+        and then once more at the end, so the files are complete as soon as
+        the block is left. Blocks may be nested; only the outermost one writes.
+        """
+        with self._lock:
+            self._batch_depth += 1
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Write deferred records when the outermost block exits"""
+        with self._lock:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush()
     
-    def calculate_cost(self, file_size_bytes: int) -> float:
+    def batch(self) -> "UsageTracker":
+        """Context manager that saves pending history on exit (same as `with tracker:`)"""
+        return self
+    
+    def flush(self):
+        """Write pending usage records to file, if there are any"""
+        with self._lock:
+            self._flush()
+    
+    def _flush(self):
+        """Write pending records (caller must hold the lock)"""
+        if self._dirty:
+            self._log.flush()
+            self._save_data()
+            self._dirty = False
+            self._pending = 0
+            self._last_save = time.monotonic()
+    
+    def _append_record(self, record: Dict):
+        """Append one record to the log (caller must hold the lock)"""
+        if self._log is None:
+            # Owner-only, like the totals file: records contain file names
+            fd = os.open(self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            self._log = os.fdopen(fd, 'ab')
+            if self._log_is_torn():
+                # Terminate a line cut short by an interrupted run, so the new
+                # record starts on its own line instead of being glued onto it
+                self._log.write(b"\n")
+        self._log.write(_dumps_line(record))
+    
+    def _log_is_torn(self) -> bool:
+        """Whether the record log is non-empty and does not end with a newline"""
+        try:
+            with open(self.log_file, 'rb') as f:
+                if f.seek(0, os.SEEK_END) == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            return False
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def calculate_cost(file_size_bytes: int) -> float:
         """
         Calculate cost based on file size
         
@@ -53,6 +267,9 @@ class UsageTracker:
         
         Rough estimate: 1MB = approximately 10 pages
         
+        Results are memoized per byte count, since the same sizes are looked
+        up again for display, the run total and the usage record.
+        
         Args:
             file_size_bytes: File size (bytes)
             
@@ -88,7 +305,7 @@ class UsageTracker:
         cost = self.calculate_cost(file_size_bytes)
         
         translation_record = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
             "input_file": os.path.basename(input_file),
             "output_file": os.path.basename(output_file),
             "source_lang": source_lang,
@@ -97,12 +314,23 @@ class UsageTracker:
             "estimated_cost_usd": cost
         }
         
-        self.data["translations"].append(translation_record)
-        self.data["total_files"] += 1
-        self.data["total_cost_usd"] = round(self.data["total_cost_usd"] + cost, 2)
-        self.data["total_size_mb"] = round(self.data["total_size_mb"] + file_size_mb, 2)
-        
-        self._save_data()
+        with self._lock:
+            try:
+                self._append_record(translation_record)
+            except Exception as e:
+                echo(f"⚠️ Failed to save usage history: {str(e)}", err=True)
+                return
+            
+            self.data["total_files"] += 1
+            self.data["total_cost_usd"] = round(self.data["total_cost_usd"] + cost, 2)
+            self.data["total_size_mb"] = round(self.data["total_size_mb"] + file_size_mb, 2)
+            _add_to_month(self.data["monthly_index"], translation_record)
+            
+            self._dirty = True
+            self._pending += 1
+            if (self._pending >= USAGE_SAVE_EVERY
+                    or time.monotonic() - self._last_save >= USAGE_SAVE_INTERVAL_SEC):
+                self._flush()
     
     def get_summary(self) -> Dict:
         """Overall usage summary"""
@@ -110,46 +338,96 @@ class UsageTracker:
             "total_files": self.data["total_files"],
             "total_cost_usd": self.data["total_cost_usd"],
             "total_size_mb": self.data["total_size_mb"],
-            "translation_count": len(self.data["translations"])
+            "translation_count": self.data["total_files"]
         }
     
-    def get_recent_translations(self, limit: int = 10) -> List[Dict]:
-        """View recent translation records"""
-        translations = self.data["translations"]
-        return translations[-limit:] if len(translations) > limit else translations
+    def get_recent_translations(self, limit: int = 10, order: str = "asc") -> List[Dict]:
+        """
+        View recent translation records
+        
+        Args:
+            limit: Maximum number of records
+            order: "asc" for oldest first, "desc" for newest first
+            
+        Returns:
+            List of translation records
+        """
+        recent = list(deque(self.iter_translations(), maxlen=limit))
+        return recent[::-1] if order == "desc" else recent
     
     def get_all_translations(self) -> List[Dict]:
         """View all translation records"""
-        return self.data["translations"]
+        return list(self.iter_translations())
+    
+    def iter_translations(self) -> Iterator[Dict]:
+        """
+        Iterate over translation records, oldest first, without loading them all
+        
+        Yields:
+            Translation records
+        """
+        with self._lock:
+            if self._log:
+                self._log.flush()
+        
+        try:
+            f = open(self.log_file, 'rb')
+        except FileNotFoundError:
+            return
+        
+        with f:
+            for line in f:
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    # Blank line or a record cut short by an interrupted run
+                    continue
     
     def get_monthly_summary(self, year: int, month: int) -> Dict:
-        """Monthly usage summary"""
-        monthly_data = {
+        """Monthly usage summary (looked up in the monthly index, not by scanning records)"""
+        totals = self.data["monthly_index"].get(f"{year:04d}-{month:02d}", {})
+        
+        return {
             "year": year,
             "month": month,
-            "files": 0,
-            "cost_usd": 0.0,
-            "size_mb": 0.0
+            "files": totals.get("files", 0),
+            "cost_usd": totals.get("cost_usd", 0.0),
+            "size_mb": totals.get("size_mb", 0.0)
         }
-        
-        for record in self.data["translations"]:
-            timestamp = datetime.fromisoformat(record["timestamp"])
-            if timestamp.year == year and timestamp.month == month:
-                monthly_data["files"] += 1
-                monthly_data["cost_usd"] += record["estimated_cost_usd"]
-                monthly_data["size_mb"] += record["file_size_mb"]
-        
-        monthly_data["cost_usd"] = round(monthly_data["cost_usd"], 2)
-        monthly_data["size_mb"] = round(monthly_data["size_mb"], 2)
-        
-        return monthly_data
     
     def clear_history(self):
         """Clear usage history"""
-        self.data = {
-            "total_files": 0,
-            "total_cost_usd": 0.0,
-            "total_size_mb": 0.0,
-            "translations": []
-        }
-        self._save_data()
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+            with suppress(FileNotFoundError):
+                os.remove(self.log_file)
+            
+            self.data = _empty_totals()
+            self._dirty = False
+            self._save_data()
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_tracker(usage_file: str) -> UsageTracker:
+    """Create the one tracker for an absolute usage file path"""
+    return UsageTracker(usage_file)
+
+
+def get_tracker(usage_file: str = USAGE_HISTORY_FILE) -> UsageTracker:
+    """
+    Get the shared usage tracker for a usage file
+    
+    The file is parsed once per process; later calls return the same tracker,
+    re-reading the totals only if the file was modified by someone else.
+    
+    Args:
+        usage_file: JSON file path to save usage totals
+        
+    Returns:
+        UsageTracker instance
+    """
+    tracker = _shared_tracker(os.path.abspath(usage_file))
+    tracker.reload_if_changed()
+    return tracker
@@ -1,27 +1,80 @@
 """Utility functions"""
 
 import os
-from typing import List, Tuple
+import shutil
+import threading
+import click
+from operator import itemgetter
+from typing import BinaryIO, Iterable, List, Tuple, Union
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+PATH_SEPARATORS = tuple(sep for sep in (os.sep, os.altsep) if sep)
+PDF_SUFFIX = '.pdf'  # Lower-case suffix accepted by the directory scanners
+SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+_created_dirs = set()  # Directories ensure_dir() has already created in this process
+
+# Serializes console writes from concurrent translations so blocks never interleave
+_print_lock = threading.Lock()
+
+
+def echo(message: str, err: bool = False) -> None:
+    """
+    Write one message to the console while holding the shared print lock
+    
+    Args:
+        message: Text to print (one write, however many lines it has)
+        err: Write to stderr instead of stdout
+    """
+    with _print_lock:
+        click.echo(message, err=err)
+
+
+def ensure_dir(directory: str) -> None:
+    """
+    Create a directory (and parents) once per process, however many files go into it
+    
+    Args:
+        directory: Directory path (empty for the current directory)
+    """
+    if directory and directory not in _created_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _created_dirs.add(directory)
 
 
 def save_translated_document(
-    document_content: bytes,
-    output_path: str
-) -> None:
+    document_content: Union[bytes, BinaryIO, Iterable[bytes]],
+    output_path: str,
+    create_dirs: bool = True
+) -> int:
     """
     Save translated document to file
     
     Args:
-        document_content: Binary data of translated document
+        document_content: Translated document as a bytes-like object, a binary
+            file-like object, or an iterable of byte chunks
         output_path: Output file path
+        create_dirs: Whether to create the output directory (skip if the caller already did)
+        
+    Returns:
+        Number of bytes written
     """
     try:
         # Create output directory
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        if create_dirs:
+            ensure_dir(os.path.dirname(output_path))
         
-        # Save file
-        with open(output_path, 'wb') as f:
-            f.write(document_content)
+        with open(output_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            if hasattr(document_content, "read"):
+                # Stream readable sources through in buffer-sized chunks
+                shutil.copyfileobj(document_content, f, WRITE_BUFFER_SIZE)
+                return f.tell()
+            
+            if isinstance(document_content, (bytes, bytearray, memoryview)):
+                # Save straight from the response buffer without an intermediate copy
+                return f.write(memoryview(document_content))
+            
+            return sum(f.write(chunk) for chunk in document_content)
             
     except Exception as e:
         raise Exception(f"Document save error: {str(e)}")
@@ -39,11 +92,14 @@ def get_pdf_files(directory: str) -> List[str]:
     """
     pdf_files = []
     
-    for file in os.listdir(directory):
-        if file.lower().endswith('.pdf'):
-            pdf_files.append(os.path.join(directory, file))
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name[-4:].lower() == PDF_SUFFIX and entry.is_file():
+                pdf_files.append(entry.path)
     
-    return sorted(pdf_files)
+    # Only the matching PDFs were collected; sort them in place
+    pdf_files.sort()
+    return pdf_files
 
 
 def get_pdf_files_recursive(directory: str) -> List[Tuple[str, str]]:
@@ -57,15 +113,70 @@ def get_pdf_files_recursive(directory: str) -> List[Tuple[str, str]]:
         List of (absolute_path, relative_path) tuples
     """
     pdf_files = []
+    stack = [directory]
+    
+    # Every entry path starts with the root as given, so the relative path is
+    # a slice rather than an os.path.relpath call (which normalizes both paths)
+    prefix_len = len(directory if directory.endswith(PATH_SEPARATORS) else directory + os.sep)
     
-    for root, dirs, files in os.walk(directory):
-        for file in files:
-            if file.lower().endswith('.pdf'):
-                abs_path = os.path.join(root, file)
-                rel_path = os.path.relpath(abs_path, directory)
-                pdf_files.append((abs_path, rel_path))
+    # DirEntry caches the file type from readdir, so no extra stat per entry;
+    # the cheap name check runs first so only PDF names reach is_file(), and it
+    # lower-cases only the last four characters rather than the whole name
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            # Skip folders that cannot be read, as os.walk does
+            continue
+        
+        with entries:
+            for entry in entries:
+                if entry.name[-4:].lower() == PDF_SUFFIX and entry.is_file():
+                    pdf_files.append((entry.path, entry.path[prefix_len:]))
+                elif entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+    
+    pdf_files.sort(key=itemgetter(1))
+    return pdf_files
+
+
+def split_suffix(filename: str) -> Tuple[str, str]:
+    """
+    Split a file name into its stem and lower-cased extension
+    
+    Only the last dot counts, and a leading dot (e.g. ".docx" as a whole
+    name) starts a hidden file name rather than an extension.
+    
+    Args:
+        filename: File name without folders
+        
+    Returns:
+        Tuple of (stem, extension), extension including its dot or empty
+    """
+    dot = filename.rfind('.')
+    if dot <= 0:
+        return filename, ''
+    return filename[:dot], filename[dot:].lower()
+
+
+def relative_path(path: str, base_dir: str) -> str:
+    """
+    Get path relative to base_dir
+    
+    Paths discovered under base_dir already start with it, so the prefix is
+    sliced off directly; anything else falls back to os.path.relpath.
     
-    return sorted(pdf_files, key=lambda x: x[1])
+    Args:
+        path: File path
+        base_dir: Base directory
+        
+    Returns:
+        Relative path
+    """
+    prefix = base_dir if base_dir.endswith(PATH_SEPARATORS) else base_dir + os.sep
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    return os.path.relpath(path, base_dir)
 
 
 def format_file_size(size_bytes: int) -> str:
@@ -78,8 +189,10 @@ def format_file_size(size_bytes: int) -> str:
     Returns:
         Formatted size string
     """
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.1f} TB"
+    if size_bytes < 1024:
+        return f"{size_bytes:.1f} B"
+    
+    # Each unit is 2**10 times the previous one, so the unit index is the
+    # position of the highest set bit divided by 10
+    exponent = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (exponent * 10)):.1f} {SIZE_UNITS[exponent]}"
@@ -1,12 +1,13 @@
 """Validation functions for inputs and credentials"""
 
 import os
+import stat
 import sys
 import click
-from pathlib import Path
 from typing import Optional, Tuple
 
-from .config import MAX_FILE_SIZE_BYTES, SUPPORTED_MIME_TYPES
+from .utils import split_suffix
+from .config import MAX_FILE_SIZE_BYTES, SUPPORTED_SUFFIXES, SUPPORTED_SUFFIXES_TEXT
 
 
 def validate_credentials() -> Tuple[str, str]:
@@ -27,7 +28,13 @@ def validate_credentials() -> Tuple[str, str]:
         click.echo("   GOOGLE_APPLICATION_CREDENTIALS=./credentials.json", err=True)
         sys.exit(1)
     
-    if not os.path.exists(credentials_path):
+    # One stat both checks existence and rejects folders given by mistake
+    try:
+        credentials_is_file = stat.S_ISREG(os.stat(credentials_path).st_mode)
+    except OSError:
+        credentials_is_file = False
+    
+    if not credentials_is_file:
         click.echo(f"❌ Error: Credential file not found: {credentials_path}", err=True)
         click.echo("💡 Download the service account key from Google Cloud Console.", err=True)
         sys.exit(1)
@@ -42,36 +49,64 @@ def validate_credentials() -> Tuple[str, str]:
     return credentials_path, project_id
 
 
-def validate_file_path(file_path: str) -> None:
+def stat_and_validate(file_path: str) -> os.stat_result:
     """
-    Validate that file exists and is a supported type
+    Validate that file exists, is a regular file and is a supported type
+    
+    A single os.stat call answers existence, type and size, so callers can
+    take the file size from the returned result instead of stat-ing again.
     
     Args:
         file_path: Path to file to validate
         
+    Returns:
+        os.stat_result of the file
+        
     Raises:
         click.ClickException if validation fails
     """
-    if not os.path.exists(file_path):
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
         raise click.ClickException(f"File not found: {file_path}")
     
-    ext = Path(file_path).suffix.lower()
-    if ext not in SUPPORTED_MIME_TYPES:
-        supported = ', '.join(SUPPORTED_MIME_TYPES.keys())
-        raise click.ClickException(f"Unsupported file type: {ext}. Supported types: {supported}")
+    if not stat.S_ISREG(file_stat.st_mode):
+        raise click.ClickException(f"Not a file: {file_path}")
+    
+    # Extension of the file name only (a dot in a folder name does not count)
+    _, ext = split_suffix(os.path.basename(file_path))
+    if ext not in SUPPORTED_SUFFIXES:
+        raise click.ClickException(f"Unsupported file type: {ext}. Supported types: {SUPPORTED_SUFFIXES_TEXT}")
+    
+    return file_stat
+
+
+def validate_file_path(file_path: str) -> None:
+    """
+    Validate that file exists and is a supported type
+    
+    Args:
+        file_path: Path to file to validate
+        
+    Raises:
+        click.ClickException if validation fails
+    """
+    stat_and_validate(file_path)
 
 
-def check_file_size(file_path: str) -> Tuple[int, bool]:
+def check_file_size(file_path: str, file_size: Optional[int] = None) -> Tuple[int, bool]:
     """
     Check file size and return size info
     
     Args:
         file_path: Path to file to check
+        file_size: Already known file size in bytes (skips the stat call)
         
     Returns:
         Tuple of (file_size_bytes, exceeds_limit)
     """
-    file_size = os.path.getsize(file_path)
+    if file_size is None:
+        file_size = os.path.getsize(file_path)
     exceeds_limit = file_size > MAX_FILE_SIZE_BYTES
     
     return file_size, exceeds_limit